@@ -1,7 +1,20 @@
 """Module for querying against Snowflake databases."""
 
 import asyncio
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import inspect
+from contextlib import ExitStack
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+)
 
 from prefect import task
 from prefect.blocks.abstract import DatabaseBlock
@@ -19,9 +32,26 @@ from snowflake.connector.cursor import SnowflakeCursor
 
 from prefect_snowflake import SnowflakeCredentials
 
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
 BEGIN_TRANSACTION_STATEMENT = "BEGIN TRANSACTION"
 END_TRANSACTION_STATEMENT = "COMMIT"
 
+# the first status check is made shortly after submitting a query, and the delay
+# is doubled after each check until it reaches the configured poll frequency
+_INITIAL_POLL_DELAY_S = 0.005
+
+# connectors before 3.0 return None instead of an empty table when there are no
+# results, and do not accept `force_return_table`
+_FETCH_ARROW_ALL_FORCES_TABLE = "force_return_table" in (
+    inspect.signature(SnowflakeCursor.fetch_arrow_all).parameters
+)
+
+ResultFormat = Literal["rows", "arrow", "pandas"]
+QueryResult = Union[List[Tuple[Any]], "pyarrow.Table", "pandas.DataFrame"]
+
 
 class SnowflakeConnector(DatabaseBlock):
 
@@ -45,7 +75,11 @@ class SnowflakeConnector(DatabaseBlock):
         schema: The name of the default schema to use;
             this attribute is accessible through `SnowflakeConnector(...).schema_`.
         fetch_size: The number of rows to fetch at a time.
-        poll_frequency_s: The number of seconds before checking query.
+        poll_frequency_s: The maximum number of seconds between checks of the
+            query status; checks start sooner and back off up to this interval.
+        client_prefetch_threads: The number of threads used to download
+            the results of a query; defaults to the Snowflake connector's own
+            default when not set.
 
     Examples:
         Load stored Snowflake connector as a context manager:
@@ -84,6 +118,10 @@ class SnowflakeConnector(DatabaseBlock):
     _documentation_url = "https://prefecthq.github.io/prefect-snowflake/database/#prefect_snowflake.database.SnowflakeConnector"  # noqa
     _description = "Perform data operations against a Snowflake database."
 
+    class Config:
+        # allows `schema_` to be passed directly, in addition to the `schema` alias
+        allow_population_by_field_name = True
+
     credentials: SnowflakeCredentials = Field(
         default=..., description="The credentials to authenticate with Snowflake."
     )
@@ -105,10 +143,17 @@ class SnowflakeConnector(DatabaseBlock):
         default=1,
         title="Poll Frequency [seconds]",
         description=(
-            "The number of seconds between checking query "
+            "The maximum number of seconds between checking query "
             "status for long running queries."
         ),
     )
+    client_prefetch_threads: Optional[int] = Field(
+        default=None,
+        description=(
+            "The number of threads used to download the results of a query; "
+            "lower values reduce thread start-up overhead for small results."
+        ),
+    )
 
     _connection: Optional[SnowflakeConnection] = None
     _unique_cursors: Dict[str, SnowflakeCursor] = None
@@ -116,7 +161,8 @@ class SnowflakeConnector(DatabaseBlock):
     def get_connection(self, **connect_kwargs: Any) -> SnowflakeConnection:
         """
         Returns an authenticated connection that can be
-        used to query from Snowflake databases.
+        used to query from Snowflake databases. The connection is reused
+        across calls, and a new one is opened if it has been closed.
 
         Args:
             **connect_kwargs: Additional arguments to pass to
@@ -146,13 +192,20 @@ class SnowflakeConnector(DatabaseBlock):
             ```
         """
         if self._connection is not None:
-            return self._connection
+            if not self._connection.is_closed():
+                return self._connection
+            # the connection was closed outside of the block, e.g. by exiting
+            # `with connector.get_connection() as connection:`, so open a new one
+            # rather than handing back the closed connection and its cursors
+            self._unique_cursors = None
 
         connect_params = {
             "database": self.database,
             "warehouse": self.warehouse,
             "schema": self.schema_,
         }
+        if self.client_prefetch_threads is not None:
+            connect_params["client_prefetch_threads"] = self.client_prefetch_threads
         connection = self.credentials.get_client(**connect_kwargs, **connect_params)
         self._connection = connection
         self.logger.info("Started a new connection to Snowflake.")
@@ -205,16 +258,11 @@ class SnowflakeConnector(DatabaseBlock):
         response = await run_sync_in_worker_thread(cursor.execute_async, **inputs)
         self.logger.info(
             f"Executing the operation, {inputs['command']!r}, asynchronously; "
-            f"polling for the result every {self.poll_frequency_s} seconds."
+            f"polling for the result at most every {self.poll_frequency_s} seconds."
         )
 
         query_id = response["queryId"]
-        while self._connection.is_still_running(
-            await run_sync_in_worker_thread(
-                self._connection.get_query_status_throw_if_error, query_id
-            )
-        ):
-            await asyncio.sleep(self.poll_frequency_s)
+        await _wait_for_query(self._connection, query_id, self.poll_frequency_s)
         await run_sync_in_worker_thread(cursor.get_results_from_sfqid, query_id)
 
     def reset_cursors(self) -> None:
@@ -581,6 +629,170 @@ class SnowflakeConnector(DatabaseBlock):
         self._start_connection()
 
 
+async def _wait_for_query(
+    connection: SnowflakeConnection, query_id: str, poll_frequency_seconds: float
+) -> None:
+    """
+    Waits for an asynchronously submitted query to finish, backing off from
+    `_INITIAL_POLL_DELAY_S` up to `poll_frequency_seconds` between checks.
+
+    Each status check is a blocking request to Snowflake, so it is made in a
+    worker thread to keep the event loop free for other queries being awaited.
+
+    Args:
+        connection: The connection the query was submitted with.
+        query_id: The ID of the submitted query.
+        poll_frequency_seconds: Maximum number of seconds to wait in between
+            checks for run completion.
+    """
+    poll_delay = min(_INITIAL_POLL_DELAY_S, poll_frequency_seconds)
+    while connection.is_still_running(
+        await run_sync_in_worker_thread(
+            connection.get_query_status_throw_if_error, query_id
+        )
+    ):
+        await asyncio.sleep(poll_delay)
+        poll_delay = min(poll_delay * 2, poll_frequency_seconds)
+
+
+def _validate_result_format(result_format: ResultFormat) -> None:
+    """
+    Raises a `ValueError` if `result_format` is not one of the supported formats.
+    """
+    if result_format not in get_args(ResultFormat):
+        raise ValueError(
+            f"Unsupported result_format {result_format!r}; "
+            f"use one of: {', '.join(get_args(ResultFormat))}."
+        )
+
+
+def _fetch_all(cursor: SnowflakeCursor, result_format: ResultFormat) -> QueryResult:
+    """
+    Fetches all the results of the cursor's query in the requested format.
+
+    Args:
+        cursor: The cursor holding the results.
+        result_format: `rows` for a list of tuples, `arrow` for a `pyarrow.Table`,
+            or `pandas` for a `pandas.DataFrame`.
+
+    Returns:
+        The results of the query; an empty result is still returned as a
+        `pyarrow.Table` when `result_format` is `arrow`.
+    """
+    if result_format == "arrow":
+        if _FETCH_ARROW_ALL_FORCES_TABLE:
+            return cursor.fetch_arrow_all(force_return_table=True)
+        table = cursor.fetch_arrow_all()
+        if table is None:
+            import pyarrow
+
+            table = pyarrow.table({column[0]: [] for column in cursor.description})
+        return table
+    elif result_format == "pandas":
+        return cursor.fetch_pandas_all()
+    return cursor.fetchall()
+
+
+def _load_query_results(
+    cursor: SnowflakeCursor, query_id: str, result_format: ResultFormat
+) -> QueryResult:
+    """
+    Loads the results of a finished query into the cursor and fetches them.
+
+    Args:
+        cursor: The cursor the query was submitted with.
+        query_id: The ID of the finished query.
+        result_format: The format to fetch the results in.
+
+    Returns:
+        The results of the query in the requested format.
+    """
+    cursor.get_results_from_sfqid(query_id)
+    return _fetch_all(cursor, result_format)
+
+
+async def _fetch_query_results(
+    connection: SnowflakeConnection,
+    cursor: SnowflakeCursor,
+    query_id: str,
+    poll_frequency_seconds: int,
+    result_format: ResultFormat = "rows",
+) -> QueryResult:
+    """
+    Waits for an asynchronously submitted query to finish and fetches its results.
+
+    Args:
+        connection: The connection the query was submitted with.
+        cursor: The cursor the query was submitted with.
+        query_id: The ID of the submitted query.
+        poll_frequency_seconds: Maximum number of seconds to wait in between
+            checks for run completion.
+        result_format: The format to fetch the results in.
+
+    Returns:
+        The results of the query in the requested format.
+    """
+    await _wait_for_query(connection, query_id, poll_frequency_seconds)
+    # loading and downloading the results block on the network, so keep them off
+    # the event loop
+    return await run_sync_in_worker_thread(
+        _load_query_results, cursor, query_id, result_format
+    )
+
+
+async def _fetch_concurrent_query_results(
+    connection: SnowflakeConnection,
+    cursors: List[SnowflakeCursor],
+    query_ids: List[str],
+    poll_frequency_seconds: int,
+    result_format: ResultFormat = "rows",
+) -> List[QueryResult]:
+    """
+    Waits for concurrently submitted queries to finish and fetches their results.
+
+    If any of the queries fails, the waits for the others are cancelled and their
+    queries aborted before the error is raised, so that nothing keeps polling a
+    connection that is about to be closed.
+
+    Args:
+        connection: The connection the queries were submitted with.
+        cursors: The cursors the queries were submitted with, one per query.
+        query_ids: The IDs of the submitted queries.
+        poll_frequency_seconds: Maximum number of seconds to wait in between
+            checks for run completion.
+        result_format: The format to fetch the results in.
+
+    Returns:
+        The results of each query in the requested format, in submission order.
+    """
+    fetches = [
+        asyncio.ensure_future(
+            _fetch_query_results(
+                connection, cursor, query_id, poll_frequency_seconds, result_format
+            )
+        )
+        for cursor, query_id in zip(cursors, query_ids)
+    ]
+    try:
+        return await asyncio.gather(*fetches)
+    except BaseException:
+        unfinished_queries = []
+        for cursor, query_id, fetch in zip(cursors, query_ids, fetches):
+            if not fetch.done():
+                fetch.cancel()
+                unfinished_queries.append((cursor, query_id))
+        # aborting is best effort; the original error is the one worth raising
+        await asyncio.gather(
+            *fetches,
+            *(
+                run_sync_in_worker_thread(cursor.abort_query, query_id)
+                for cursor, query_id in unfinished_queries
+            ),
+            return_exceptions=True,
+        )
+        raise
+
+
 @task
 async def snowflake_query(
     query: str,
@@ -588,7 +800,8 @@ async def snowflake_query(
     params: Union[Tuple[Any], Dict[str, Any]] = None,
     cursor_type: Type[SnowflakeCursor] = SnowflakeCursor,
     poll_frequency_seconds: int = 1,
-) -> List[Tuple[Any]]:
+    result_format: ResultFormat = "rows",
+) -> QueryResult:
     """
     Executes a query against a Snowflake database.
 
@@ -597,11 +810,16 @@ async def snowflake_query(
         params: The params to replace the placeholders in the query.
         snowflake_connector: The credentials to use to authenticate.
         cursor_type: The type of database cursor to use for the query.
-        poll_frequency_seconds: Number of seconds to wait in between checks for
-            run completion.
+        poll_frequency_seconds: Maximum number of seconds to wait in between checks
+            for run completion; checks start sooner and back off up to this interval.
+        result_format: The format to return the results in; `rows` returns the
+            output of `response.fetchall()`, while `arrow` and `pandas` return a
+            `pyarrow.Table` and a `pandas.DataFrame` respectively, which avoids
+            building a Python tuple per row for large results. The latter two
+            require `snowflake-connector-python[pandas]` to be installed.
 
     Returns:
-        The output of `response.fetchall()`.
+        The results of the query in the requested `result_format`.
 
     Examples:
         Query Snowflake table with the ID value parameterized.
@@ -634,17 +852,22 @@ async def snowflake_query(
         snowflake_query_flow()
         ```
     """
+    _validate_result_format(result_format)
+    # opening the connection blocks on the network, so keep it off the event loop
+    connection = await run_sync_in_worker_thread(snowflake_connector.get_connection)
     # context manager automatically rolls back failed transactions and closes
-    with snowflake_connector.get_connection() as connection:
+    with connection:
         with connection.cursor(cursor_type) as cursor:
-            response = cursor.execute_async(query, params=params)
-            query_id = response["queryId"]
-            while connection.is_still_running(
-                connection.get_query_status_throw_if_error(query_id)
-            ):
-                await asyncio.sleep(poll_frequency_seconds)
-            cursor.get_results_from_sfqid(query_id)
-            result = cursor.fetchall()
+            response = await run_sync_in_worker_thread(
+                cursor.execute_async, query, params=params
+            )
+            result = await _fetch_query_results(
+                connection,
+                cursor,
+                response["queryId"],
+                poll_frequency_seconds,
+                result_format,
+            )
     return result
 
 
@@ -657,7 +880,9 @@ async def snowflake_multiquery(
     as_transaction: bool = False,
     return_transaction_control_results: bool = False,
     poll_frequency_seconds: int = 1,
-) -> List[List[Tuple[Any]]]:
+    run_concurrently: bool = False,
+    result_format: ResultFormat = "rows",
+) -> List[QueryResult]:
     """
     Executes multiple queries against a Snowflake database in a shared session.
     Allows execution in a transaction.
@@ -670,11 +895,21 @@ async def snowflake_multiquery(
         as_transaction: If True, queries are executed in a transaction.
         return_transaction_control_results: Determines if the results of queries
             controlling the transaction (BEGIN/COMMIT) should be returned.
-        poll_frequency_seconds: Number of seconds to wait in between checks for
-            run completion.
+        poll_frequency_seconds: Maximum number of seconds to wait in between checks
+            for run completion; checks start sooner and back off up to this interval.
+        run_concurrently: If True, all queries are submitted at once and run
+            concurrently in the session, instead of one after another; only use
+            this for queries that do not depend on each other. If one of the
+            queries fails, the others are aborted. Cannot be combined with
+            `as_transaction`.
+        result_format: The format to return the results in; `rows` returns the
+            output of `response.fetchall()`, while `arrow` and `pandas` return a
+            `pyarrow.Table` and a `pandas.DataFrame` respectively, which avoids
+            building a Python tuple per row for large results. The latter two
+            require `snowflake-connector-python[pandas]` to be installed.
 
     Returns:
-        List of the outputs of `response.fetchall()` for each query.
+        List of the results of each query in the requested `result_format`.
 
     Examples:
         Query Snowflake table with the ID value parameterized.
@@ -708,23 +943,55 @@ async def snowflake_multiquery(
         snowflake_multiquery_flow()
         ```
     """
-    with snowflake_connector.get_connection() as connection:
-        if as_transaction:
-            queries.insert(0, BEGIN_TRANSACTION_STATEMENT)
-            queries.append(END_TRANSACTION_STATEMENT)
+    _validate_result_format(result_format)
+    if as_transaction and run_concurrently:
+        raise ValueError(
+            "Queries executed as a transaction cannot be run concurrently; "
+            "set either `as_transaction` or `run_concurrently`."
+        )
 
-        with connection.cursor(cursor_type) as cursor:
-            results = []
-            for query in queries:
-                response = cursor.execute_async(query, params=params)
-                query_id = response["queryId"]
-                while connection.is_still_running(
-                    connection.get_query_status_throw_if_error(query_id)
-                ):
-                    await asyncio.sleep(poll_frequency_seconds)
-                cursor.get_results_from_sfqid(query_id)
-                result = cursor.fetchall()
-                results.append(result)
+    connection = await run_sync_in_worker_thread(snowflake_connector.get_connection)
+    with connection:
+        if as_transaction:
+            # build a new list so the caller's list of queries is left untouched
+            queries = [BEGIN_TRANSACTION_STATEMENT, *queries, END_TRANSACTION_STATEMENT]
+
+        if run_concurrently:
+            # each query gets its own cursor, so that their results can be loaded
+            # and fetched in worker threads at the same time
+            with ExitStack() as stack:
+                cursors = [
+                    stack.enter_context(connection.cursor(cursor_type)) for _ in queries
+                ]
+                responses = [
+                    await run_sync_in_worker_thread(
+                        cursor.execute_async, query, params=params
+                    )
+                    for cursor, query in zip(cursors, queries)
+                ]
+                query_ids = [response["queryId"] for response in responses]
+                results = await _fetch_concurrent_query_results(
+                    connection,
+                    cursors,
+                    query_ids,
+                    poll_frequency_seconds,
+                    result_format,
+                )
+        else:
+            with connection.cursor(cursor_type) as cursor:
+                results = []
+                for query in queries:
+                    response = await run_sync_in_worker_thread(
+                        cursor.execute_async, query, params=params
+                    )
+                    result = await _fetch_query_results(
+                        connection,
+                        cursor,
+                        response["queryId"],
+                        poll_frequency_seconds,
+                        result_format,
+                    )
+                    results.append(result)
 
     # cut off results from BEGIN/COMMIT queries
     if as_transaction and not return_transaction_control_results:
@@ -739,7 +1006,8 @@ async def snowflake_query_sync(
     snowflake_connector: SnowflakeConnector,
     params: Union[Tuple[Any], Dict[str, Any]] = None,
     cursor_type: Type[SnowflakeCursor] = SnowflakeCursor,
-) -> List[Tuple[Any]]:
+    result_format: ResultFormat = "rows",
+) -> QueryResult:
     """
     Executes a query in sync mode against a Snowflake database.
 
@@ -748,9 +1016,14 @@ async def snowflake_query_sync(
         params: The params to replace the placeholders in the query.
         snowflake_connector: The credentials to use to authenticate.
         cursor_type: The type of database cursor to use for the query.
+        result_format: The format to return the results in; `rows` returns the
+            output of `response.fetchall()`, while `arrow` and `pandas` return a
+            `pyarrow.Table` and a `pandas.DataFrame` respectively, which avoids
+            building a Python tuple per row for large results. The latter two
+            require `snowflake-connector-python[pandas]` to be installed.
 
     Returns:
-        The output of `response.fetchall()`.
+        The results of the query in the requested `result_format`.
 
     Examples:
         Execute a put statement.
@@ -782,9 +1055,14 @@ async def snowflake_query_sync(
         snowflake_query_sync_flow()
         ```
     """
-    # context manager automatically rolls back failed transactions and closes
-    with snowflake_connector.get_connection() as connection:
-        with connection.cursor(cursor_type) as cursor:
-            cursor.execute(query, params=params)
-            result = cursor.fetchall()
-    return result
+    _validate_result_format(result_format)
+
+    def _execute_query() -> QueryResult:
+        # context manager automatically rolls back failed transactions and closes
+        with snowflake_connector.get_connection() as connection:
+            with connection.cursor(cursor_type) as cursor:
+                cursor.execute(query, params=params)
+                return _fetch_all(cursor, result_format)
+
+    # run the blocking connect, execute and fetch calls off the event loop
+    return await run_sync_in_worker_thread(_execute_query)
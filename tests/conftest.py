@@ -1,23 +1,44 @@
-import os
+from functools import lru_cache
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from prefect.context import PrefectObjectRegistry
 from prefect.testing.utilities import prefect_test_harness
 
 from prefect_snowflake.credentials import SnowflakeCredentials
 
+_TEST_DATA_DIR = Path(__file__).parent / "test_data"
 
+
+@lru_cache(maxsize=None)
 def _read_test_file(name: str) -> bytes:
     """
+    Reads a file once per session; later calls return the cached content.
+
     Args:
         name: File to load from test_data folder.
 
     Returns:
         File content as binary.
     """
-    full_name = os.path.join(os.path.split(__file__)[0], "test_data", name)
-    with open(full_name, "rb") as fd:
-        return fd.read()
+    return (_TEST_DATA_DIR / name).read_bytes()
+
+
+def _private_credentials_params(cert_name: str) -> dict:
+    """
+    Args:
+        cert_name: Private key file to load from test_data folder.
+
+    Returns:
+        Credentials params authenticating with the given private key.
+    """
+    return {
+        "account": "account",
+        "user": "user",
+        "password": "letmein",
+        "private_key": _read_test_file(cert_name),
+    }
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -29,13 +50,11 @@ def prefect_db():
         yield
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture()
 def reset_object_registry():
     """
-    Ensures each test has a clean object registry.
+    Ensures a test that runs flows has a clean object registry.
     """
-    from prefect.context import PrefectObjectRegistry
-
     with PrefectObjectRegistry():
         yield
 
@@ -63,12 +82,7 @@ def connector_params(credentials_params):
 
 @pytest.fixture()
 def private_credentials_params():
-    return {
-        "account": "account",
-        "user": "user",
-        "password": "letmein",
-        "private_key": _read_test_file("test_cert.p8"),
-    }
+    return _private_credentials_params("test_cert.p8")
 
 
 @pytest.fixture()
@@ -96,12 +110,7 @@ def private_connector_params(private_credentials_params):
 
 @pytest.fixture()
 def private_no_pass_credentials_params():
-    return {
-        "account": "account",
-        "user": "user",
-        "password": "letmein",
-        "private_key": _read_test_file("test_cert_no_pass.p8"),
-    }
+    return _private_credentials_params("test_cert_no_pass.p8")
 
 
 @pytest.fixture()
@@ -119,12 +128,7 @@ def private_no_pass_connector_params(private_no_pass_credentials_params):
 
 @pytest.fixture()
 def private_malformed_credentials_params():
-    return {
-        "account": "account",
-        "user": "user",
-        "password": "letmein",
-        "private_key": _read_test_file("test_cert_malformed_format.p8"),
-    }
+    return _private_credentials_params("test_cert_malformed_format.p8")
 
 
 @pytest.fixture(autouse=True)
@@ -141,6 +145,7 @@ def snowflake_connect_mock(monkeypatch):
 
     mock_connection = MagicMock(name="connection mock")
     mock_connection.return_value.is_still_running.return_value = False
+    mock_connection.return_value.is_closed.return_value = False
     mock_connection.return_value.cursor = mock_cursor
 
     monkeypatch.setattr("snowflake.connector.connect", mock_connection)
@@ -12,10 +12,24 @@ if PYDANTIC_VERSION.startswith("2."):
 else:
     from pydantic import SecretBytes, SecretStr
 
-from prefect_snowflake.credentials import InvalidPemFormat, SnowflakeCredentials
+from prefect_snowflake.credentials import (
+    _AUTH_PARAMS,
+    InvalidPemFormat,
+    SnowflakeCredentials,
+)
 from prefect_snowflake.database import SnowflakeConnector
 
 
+def _passwordless_params(credentials_params, **overrides):
+    """
+    Returns a copy of the credentials params without a password, updated with
+    the given overrides.
+    """
+    params = {**credentials_params, **overrides}
+    del params["password"]
+    return params
+
+
 def test_snowflake_credentials_init(credentials_params):
     snowflake_credentials = SnowflakeCredentials(**credentials_params)
     actual_credentials_params = snowflake_credentials.dict()
@@ -28,12 +42,24 @@ def test_snowflake_credentials_init(credentials_params):
 
 
 def test_snowflake_credentials_validate_auth_kwargs(credentials_params):
-    credentials_params_missing = credentials_params.copy()
-    credentials_params_missing.pop("password")
+    credentials_params_missing = _passwordless_params(credentials_params)
     with pytest.raises(ValueError, match="One of the authentication keys"):
         SnowflakeCredentials(**credentials_params_missing)
 
 
+@pytest.mark.parametrize("auth_param", _AUTH_PARAMS)
+def test_snowflake_credentials_validate_auth_kwargs_any_auth_param(
+    credentials_params, auth_param
+):
+    # authenticators such as oauth require other fields, externalbrowser does not
+    value = "externalbrowser" if auth_param == "authenticator" else "value"
+    credentials_params_single = {
+        **_passwordless_params(credentials_params),
+        auth_param: value,
+    }
+    assert SnowflakeCredentials(**credentials_params_single)
+
+
 def test_snowflake_credentials_validate_auth_kwargs_private_keys(credentials_params):
     credentials_params["private_key"] = "key"
     credentials_params["private_key_path"] = "keypath"
@@ -50,9 +76,9 @@ def test_snowflake_credentials_validate_auth_kwargs_private_key_password(
 
 
 def test_snowflake_credentials_validate_token_kwargs(credentials_params):
-    credentials_params_missing = credentials_params.copy()
-    credentials_params_missing.pop("password")
-    credentials_params_missing["authenticator"] = "oauth"
+    credentials_params_missing = _passwordless_params(
+        credentials_params, authenticator="oauth"
+    )
     with pytest.raises(ValueError, match="If authenticator is set to `oauth`"):
         SnowflakeCredentials(**credentials_params_missing)
 
@@ -62,9 +88,9 @@ def test_snowflake_credentials_validate_token_kwargs(credentials_params):
 
 
 def test_snowflake_credentials_validate_okta_endpoint_kwargs(credentials_params):
-    credentials_params_missing = credentials_params.copy()
-    credentials_params_missing.pop("password")
-    credentials_params_missing["authenticator"] = "okta_endpoint"
+    credentials_params_missing = _passwordless_params(
+        credentials_params, authenticator="okta_endpoint"
+    )
     with pytest.raises(ValueError, match="If authenticator is set to `okta_endpoint`"):
         SnowflakeCredentials(**credentials_params_missing)
 
@@ -75,10 +101,11 @@ def test_snowflake_credentials_validate_okta_endpoint_kwargs(credentials_params)
 
 
 def test_snowflake_credentials_support_deprecated_okta_endpoint(credentials_params):
-    credentials_params_missing = credentials_params.copy()
-    credentials_params_missing.pop("password")
-    credentials_params_missing["authenticator"] = "okta_endpoint"
-    credentials_params_missing["okta_endpoint"] = "deprecated.com"
+    credentials_params_missing = _passwordless_params(
+        credentials_params,
+        authenticator="okta_endpoint",
+        okta_endpoint="deprecated.com",
+    )
     snowflake_credentials = SnowflakeCredentials(**credentials_params_missing)
     assert snowflake_credentials.endpoint == "deprecated.com"
 
@@ -86,11 +113,12 @@ def test_snowflake_credentials_support_deprecated_okta_endpoint(credentials_para
 def test_snowflake_credentials_support_endpoint_overrides_okta_endpoint(
     credentials_params,
 ):
-    credentials_params_missing = credentials_params.copy()
-    credentials_params_missing.pop("password")
-    credentials_params_missing["authenticator"] = "okta_endpoint"
-    credentials_params_missing["okta_endpoint"] = "deprecated.com"
-    credentials_params_missing["endpoint"] = "new.com"
+    credentials_params_missing = _passwordless_params(
+        credentials_params,
+        authenticator="okta_endpoint",
+        okta_endpoint="deprecated.com",
+        endpoint="new.com",
+    )
     snowflake_credentials = SnowflakeCredentials(**credentials_params_missing)
     assert snowflake_credentials.endpoint == "new.com"
 
@@ -119,6 +147,14 @@ def test_snowflake_private_credentials_malformed_certificate(
     assert c1 == c2
 
 
+def test_snowflake_private_credentials_resolve_private_key_cached(
+    private_credentials_params,
+):
+    credentials = SnowflakeCredentials(**private_credentials_params)
+    private_der_key = credentials.resolve_private_key()
+    assert credentials.resolve_private_key() is private_der_key
+
+
 def test_snowflake_private_credentials_invalid_certificate(private_credentials_params):
     private_credentials_params["private_key"] = "---- INVALID CERTIFICATE ----"
     with pytest.raises(InvalidPemFormat):
@@ -167,6 +203,25 @@ def test_snowflake_credentials_validate_private_key_path(
     assert credentials.resolve_private_key() is not None
 
 
+def test_snowflake_credentials_private_key_path_is_reread(
+    private_credentials_params, tmp_path
+):
+    private_key_path = tmp_path / "private_key.pem"
+    private_key_path.write_bytes(private_credentials_params.pop("private_key"))
+    credentials = SnowflakeCredentials(
+        **_passwordless_params(
+            private_credentials_params,
+            private_key_path=private_key_path,
+            private_key_passphrase=private_credentials_params["password"],
+        )
+    )
+    assert credentials.resolve_private_key() is not None
+
+    private_key_path.write_bytes(b"_invalid_key_")
+    with pytest.raises(InvalidPemFormat):
+        credentials.resolve_private_key()
+
+
 def test_snowflake_credentials_validate_private_key_invalid(private_credentials_params):
     credentials_params_missing = private_credentials_params.copy()
     private_key = credentials_params_missing.pop("private_key")
@@ -178,6 +233,16 @@ def test_snowflake_credentials_validate_private_key_invalid(private_credentials_
         assert credentials.resolve_private_key() is not None
 
 
+def test_snowflake_credentials_resolve_private_key_cache_invalidated(
+    private_credentials_params,
+):
+    credentials = SnowflakeCredentials(**private_credentials_params)
+    assert credentials.resolve_private_key() is not None
+    credentials.password = "_wrong_password"
+    with pytest.raises(ValueError):
+        credentials.resolve_private_key()
+
+
 def test_snowflake_credentials_validate_private_key_unexpected_password(
     private_credentials_params,
 ):
@@ -255,14 +320,97 @@ def test_get_client(credentials_params, snowflake_connect_mock: MagicMock):
     )
 
 
+def test_get_client_caches_connect_params(
+    credentials_params, snowflake_connect_mock: MagicMock
+):
+    snowflake_credentials = SnowflakeCredentials(**credentials_params)
+    connect_params = snowflake_credentials._get_connect_params()
+    assert snowflake_credentials._get_connect_params() is connect_params
+
+    snowflake_credentials.role = "MY_ROLE"
+    assert snowflake_credentials._get_connect_params() is not connect_params
+    snowflake_credentials.get_client()
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        password="password",
+        role="MY_ROLE",
+    )
+
+
+def test_get_client_copy_does_not_reuse_connect_params(
+    credentials_params, snowflake_connect_mock: MagicMock
+):
+    snowflake_credentials = SnowflakeCredentials(**credentials_params)
+    snowflake_credentials.get_client()
+
+    okta_endpoint = "https://account_name.okta.com"
+    snowflake_credentials.copy(
+        update={
+            "password": None,
+            "authenticator": "okta_endpoint",
+            "endpoint": okta_endpoint,
+        }
+    ).get_client()
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        password=None,
+        authenticator=okta_endpoint,
+    )
+
+    snowflake_credentials.copy(update={"role": "MY_ROLE"}).get_client()
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        password="password",
+        role="MY_ROLE",
+    )
+
+
+def test_snowflake_private_credentials_copy_does_not_reuse_private_key(
+    private_credentials_params, private_no_pass_credentials_params
+):
+    snowflake_credentials = SnowflakeCredentials(**private_credentials_params)
+    private_der_key = snowflake_credentials.resolve_private_key()
+
+    copied_credentials = snowflake_credentials.copy(
+        update={
+            "private_key": SecretBytes(
+                private_no_pass_credentials_params["private_key"]
+            ),
+            "password": None,
+        }
+    )
+    assert copied_credentials.resolve_private_key() != private_der_key
+    assert snowflake_credentials.resolve_private_key() is private_der_key
+
+
+def test_get_client_excludes_block_metadata(
+    credentials_params, snowflake_connect_mock: MagicMock
+):
+    snowflake_credentials = SnowflakeCredentials(**credentials_params)
+    snowflake_credentials._block_document_id = "block-document-id"
+    snowflake_credentials._block_document_name = "block-document-name"
+    snowflake_credentials.get_client()
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        password="password",
+    )
+
+
 def test_get_client_okta_endpoint(
     credentials_params, snowflake_connect_mock: MagicMock
 ):
     okta_endpoint = "https://account_name.okta.com"
-    credentials_params_okta_endpoint = credentials_params.copy()
-    del credentials_params_okta_endpoint["password"]
-    credentials_params_okta_endpoint["authenticator"] = "okta_endpoint"
-    credentials_params_okta_endpoint["endpoint"] = okta_endpoint
+    credentials_params_okta_endpoint = _passwordless_params(
+        credentials_params, authenticator="okta_endpoint", endpoint=okta_endpoint
+    )
     snowflake_credentials = SnowflakeCredentials(**credentials_params_okta_endpoint)
     snowflake_credentials.get_client()
     snowflake_connect_mock.assert_called_with(
@@ -277,10 +425,9 @@ def test_snowflake_credentials_deprecated_okta_endpoint(
     credentials_params, snowflake_connect_mock: MagicMock
 ):
     okta_endpoint = "https://account_name.okta.com"
-    credentials_params_okta_endpoint = credentials_params.copy()
-    del credentials_params_okta_endpoint["password"]
-    credentials_params_okta_endpoint["authenticator"] = "okta_endpoint"
-    credentials_params_okta_endpoint["endpoint"] = okta_endpoint
+    credentials_params_okta_endpoint = _passwordless_params(
+        credentials_params, authenticator="okta_endpoint", endpoint=okta_endpoint
+    )
     snowflake_credentials = SnowflakeCredentials(**credentials_params_okta_endpoint)
     snowflake_credentials.get_client()
     snowflake_connect_mock.assert_called_with(
@@ -314,19 +461,17 @@ def test_snowflake_credentials_unencrypted_private_key_no_password(
     snowflake_credentials.get_client()
 
 
+@pytest.mark.parametrize(
+    "password",
+    [SecretBytes(b" "), SecretBytes(b""), SecretStr(""), SecretStr("   ")],
+)
 def test_snowflake_credentials_unencrypted_private_key_empty_password(
-    private_no_pass_credentials_params, snowflake_connect_mock: MagicMock
+    private_no_pass_credentials_params, snowflake_connect_mock: MagicMock, password
 ):
     snowflake_credentials = SnowflakeCredentials(**private_no_pass_credentials_params)
     assert snowflake_credentials.private_key is not None
 
-    snowflake_credentials.password = SecretBytes(b" ")
-    snowflake_credentials.get_client()
-    snowflake_credentials.password = SecretBytes(b"")
-    snowflake_credentials.get_client()
-    snowflake_credentials.password = SecretStr("")
-    snowflake_credentials.get_client()
-    snowflake_credentials.password = SecretStr("   ")
+    snowflake_credentials.password = password
     snowflake_credentials.get_client()
 
 
@@ -340,6 +485,50 @@ def test_snowflake_credentials_encrypted_private_key_is_valid(
     snowflake_credentials.get_client()
 
 
+def test_get_client_private_key_replaces_password(
+    private_credentials_params, snowflake_connect_mock: MagicMock
+):
+    snowflake_credentials = SnowflakeCredentials(**private_credentials_params)
+    snowflake_credentials.get_client()
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        private_key=snowflake_credentials.resolve_private_key(),
+    )
+
+
+def test_get_client_private_key_replaces_password_kwarg(
+    private_credentials_params, snowflake_connect_mock: MagicMock
+):
+    snowflake_credentials = SnowflakeCredentials(**private_credentials_params)
+    snowflake_credentials.get_client(password="other_password")
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        private_key=snowflake_credentials.resolve_private_key(),
+    )
+
+
+def test_get_client_okta_endpoint_kwarg(
+    credentials_params, snowflake_connect_mock: MagicMock
+):
+    okta_endpoint = "https://account_name.okta.com"
+    snowflake_credentials = SnowflakeCredentials(
+        **credentials_params, endpoint=okta_endpoint
+    )
+    snowflake_credentials.get_client(authenticator="okta_endpoint")
+    snowflake_connect_mock.assert_called_with(
+        application="Prefect_Snowflake_Collection",
+        account="account",
+        user="user",
+        password="password",
+        authenticator=okta_endpoint,
+    )
+
+
+@pytest.mark.usefixtures("reset_object_registry")
 def test_snowflake_with_no_private_key_flow():
     """
     https://github.com/PrefectHQ/prefect-snowflake/issues/62
@@ -367,6 +556,7 @@ def test_snowflake_with_no_private_key_flow():
     assert snowflake_connector.credentials.password.get_secret_value() == "password"
 
 
+@pytest.mark.usefixtures("reset_object_registry")
 def test_snowflake_with_private_key_path_flow():
     """
     https://github.com/PrefectHQ/prefect-snowflake/issues/62
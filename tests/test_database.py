@@ -1,3 +1,6 @@
+import asyncio
+import threading
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
@@ -16,23 +19,39 @@ from prefect_snowflake.database import (
     BEGIN_TRANSACTION_STATEMENT,
     END_TRANSACTION_STATEMENT,
     SnowflakeConnector,
+    _fetch_all,
+    _wait_for_query,
     snowflake_multiquery,
     snowflake_query,
     snowflake_query_sync,
 )
 
+_PARAMS = ("param",)
+
 
 def test_snowflake_connector_init(connector_params):
     snowflake_connector = SnowflakeConnector(**connector_params)
-    actual_connector_params = snowflake_connector.dict()
-    for param in connector_params:
-        expected = connector_params[param]
-        if param == "schema":
-            param = "schema_"
-        actual = actual_connector_params[param]
-        if isinstance(actual, SecretStr):
-            actual = actual.get_secret_value()
-        assert actual == expected
+    expected = {
+        ("schema_" if param == "schema" else param): value
+        for param, value in connector_params.items()
+    }
+    actual = {
+        param: value.get_secret_value() if isinstance(value, SecretStr) else value
+        for param, value in snowflake_connector.dict().items()
+        if param in expected
+    }
+    assert actual == expected
+
+
+def test_snowflake_connector_init_by_field_name(connector_params):
+    connector_params["schema_"] = connector_params.pop("schema")
+    snowflake_connector = SnowflakeConnector(**connector_params)
+    assert snowflake_connector.schema_ == "schema_input"
+
+
+def test_snowflake_connector_shares_credentials(connector_params):
+    snowflake_connector = SnowflakeConnector(**connector_params)
+    assert snowflake_connector.credentials is connector_params["credentials"]
 
 
 def test_snowflake_connector_password_is_secret_str(connector_params):
@@ -49,6 +68,11 @@ def test_snowflake_connector_private_key_is_secret(private_connector_params):
 
 
 class SnowflakeCursor:
+    __slots__ = ("result", "query_result")
+
+    def __init__(self):
+        self.result = {}
+
     def __enter__(self):
         return self
 
@@ -56,8 +80,10 @@ class SnowflakeCursor:
         return False
 
     def execute_async(self, query, params):
-        query_id = "1234"
-        self.result = {query_id: [(query, params)]}
+        # queries are unique within each test, so they double as query IDs
+        # that stay unique across cursors
+        query_id = query
+        self.result[query_id] = [(query, params)]
         return {"queryId": query_id}
 
     def get_results_from_sfqid(self, query_id):
@@ -66,12 +92,23 @@ class SnowflakeCursor:
     def fetchall(self):
         return self.query_result
 
+    def fetch_arrow_all(self, force_return_table=False):
+        # like the connector, return None for an empty result unless forced
+        if not self.query_result and not force_return_table:
+            return None
+        return ("arrow", self.query_result)
+
+    def fetch_pandas_all(self):
+        return ("pandas", self.query_result)
+
     def execute(self, query, params=None):
         self.query_result = [(query, params, "sync")]
         return self
 
 
 class SnowflakeConnection:
+    __slots__ = ()
+
     def __enter__(self):
         return self
 
@@ -88,109 +125,233 @@ class SnowflakeConnection:
         return False
 
 
-@pytest.fixture()
-def snowflake_connector(snowflake_connect_mock):
-    snowflake_connector_mock = MagicMock()
-    snowflake_connector_mock.get_connection.return_value = SnowflakeConnection()
-    return snowflake_connector_mock
+@pytest.fixture(scope="module")
+def snowflake_connector():
+    return SimpleNamespace(get_connection=SnowflakeConnection)
+
+
+@flow
+def query_flow(snowflake_connector, result_format="rows"):
+    return snowflake_query(
+        "query", snowflake_connector, params=_PARAMS, result_format=result_format
+    )
+
 
+@flow
+def query_sync_flow(snowflake_connector, result_format="rows"):
+    return snowflake_query_sync(
+        "query", snowflake_connector, params=_PARAMS, result_format=result_format
+    )
 
+
+@pytest.mark.usefixtures("reset_object_registry")
 def test_snowflake_query(snowflake_connector):
-    @flow
-    def test_flow():
-        result = snowflake_query(
-            "query",
-            snowflake_connector,
-            params=("param",),
-        )
-        return result
+    result = query_flow(snowflake_connector)
+    assert result == [("query", _PARAMS)]
 
-    result = test_flow()
-    assert result[0][0] == "query"
-    assert result[0][1] == ("param",)
 
+@pytest.mark.usefixtures("reset_object_registry")
+@pytest.mark.parametrize("result_format", ["arrow", "pandas"])
+def test_snowflake_query_result_format(snowflake_connector, result_format):
+    result = query_flow(snowflake_connector, result_format=result_format)
+    assert result == (result_format, [("query", _PARAMS)])
 
-def test_snowflake_multiquery(snowflake_connector):
-    @flow
-    def test_flow():
-        result = snowflake_multiquery(
-            ["query1", "query2"],
-            snowflake_connector,
-            params=("param",),
-        )
-        return result
-
-    result = test_flow()
-    assert result[0][0][0] == "query1"
-    assert result[0][0][1] == ("param",)
-    assert result[1][0][0] == "query2"
-    assert result[1][0][1] == ("param",)
-
-
-def test_snowflake_multiquery_transaction(snowflake_connector):
-    @flow
-    def test_flow():
-        result = snowflake_multiquery(
-            ["query1", "query2"],
-            snowflake_connector,
-            params=("param",),
-            as_transaction=True,
-        )
-        return result
 
-    result = test_flow()
-    assert result[0][0][0] == "query1"
-    assert result[0][0][1] == ("param",)
-    assert result[1][0][0] == "query2"
-    assert result[1][0][1] == ("param",)
+@flow
+def multiquery_flow(
+    snowflake_connector,
+    as_transaction=False,
+    return_transaction_control_results=False,
+    run_concurrently=False,
+):
+    return snowflake_multiquery(
+        ["query1", "query2"],
+        snowflake_connector,
+        params=_PARAMS,
+        as_transaction=as_transaction,
+        return_transaction_control_results=return_transaction_control_results,
+        run_concurrently=run_concurrently,
+    )
+
+
+_QUERY_RESULTS = [[("query1", _PARAMS)], [("query2", _PARAMS)]]
+
+
+@pytest.mark.usefixtures("reset_object_registry")
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        ({}, _QUERY_RESULTS),
+        ({"as_transaction": True}, _QUERY_RESULTS),
+        (
+            {"as_transaction": True, "return_transaction_control_results": True},
+            [
+                [(BEGIN_TRANSACTION_STATEMENT, _PARAMS)],
+                *_QUERY_RESULTS,
+                [(END_TRANSACTION_STATEMENT, _PARAMS)],
+            ],
+        ),
+        ({"run_concurrently": True}, _QUERY_RESULTS),
+    ],
+)
+def test_snowflake_multiquery(snowflake_connector, kwargs, expected):
+    assert multiquery_flow(snowflake_connector, **kwargs) == expected
 
 
-def test_snowflake_multiquery_transaction_with_transaction_control_results(
+async def test_snowflake_multiquery_transaction_does_not_modify_queries(
     snowflake_connector,
 ):
-    @flow
-    def test_flow():
-        result = snowflake_multiquery(
-            ["query1", "query2"],
-            snowflake_connector,
-            params=("param",),
-            as_transaction=True,
-            return_transaction_control_results=True,
+    queries = ["query1", "query2"]
+    await snowflake_multiquery.fn(queries, snowflake_connector, as_transaction=True)
+    assert queries == ["query1", "query2"]
+
+
+async def test_snowflake_multiquery_run_concurrently_failure():
+    aborted_query_ids = []
+    status_checks = []
+
+    class AbortableCursor(SnowflakeCursor):
+        def abort_query(self, query_id):
+            aborted_query_ids.append(query_id)
+            return True
+
+    class FailingConnection(SnowflakeConnection):
+        def cursor(self, cursor_type):
+            return AbortableCursor()
+
+        def get_query_status_throw_if_error(self, query_id):
+            status_checks.append(query_id)
+            if query_id == "query2":
+                raise RuntimeError("query failed")
+            return True
+
+    snowflake_connector = SimpleNamespace(get_connection=FailingConnection)
+    with pytest.raises(RuntimeError, match="query failed"):
+        await snowflake_multiquery.fn(
+            ["query1", "query2", "query3"], snowflake_connector, run_concurrently=True
         )
-        return result
+    assert sorted(aborted_query_ids) == ["query1", "query3"]
+
+    # the waits for the other queries were cancelled, so polling has stopped
+    status_check_count = len(status_checks)
+    await asyncio.sleep(0.05)
+    assert len(status_checks) == status_check_count
+
+
+@pytest.mark.parametrize("run_concurrently,cursor_count", [(False, 1), (True, 2)])
+async def test_snowflake_multiquery_runs_off_event_loop(run_concurrently, cursor_count):
+    cursors = []
+    execute_threads = []
+    fetch_threads = []
+
+    class RecordingCursor(SnowflakeCursor):
+        def execute_async(self, query, params):
+            execute_threads.append(threading.get_ident())
+            return super().execute_async(query, params)
+
+        def get_results_from_sfqid(self, query_id):
+            fetch_threads.append(threading.get_ident())
+            super().get_results_from_sfqid(query_id)
+
+    class RecordingConnection(SnowflakeConnection):
+        def cursor(self, cursor_type):
+            cursor = RecordingCursor()
+            cursors.append(cursor)
+            return cursor
+
+    results = await snowflake_multiquery.fn(
+        ["query1", "query2"],
+        SimpleNamespace(get_connection=RecordingConnection),
+        run_concurrently=run_concurrently,
+    )
+    assert results == [[("query1", None)], [("query2", None)]]
+    assert len(cursors) == cursor_count
+    assert len(execute_threads) == len(fetch_threads) == 2
+    assert threading.get_ident() not in execute_threads + fetch_threads
+
+
+@pytest.mark.usefixtures("reset_object_registry")
+def test_snowflake_multiquery_run_concurrently_transaction(snowflake_connector):
+    with pytest.raises(ValueError, match="cannot be run concurrently"):
+        multiquery_flow(snowflake_connector, as_transaction=True, run_concurrently=True)
+
+
+async def test_wait_for_query_checks_status_in_worker_thread():
+    status_threads = []
+    connection = SimpleNamespace(
+        get_query_status_throw_if_error=lambda query_id: status_threads.append(
+            threading.get_ident()
+        ),
+        is_still_running=lambda status: False,
+    )
+    await _wait_for_query(connection, "query_id", 1)
+    assert status_threads and threading.get_ident() not in status_threads
+
+
+@pytest.mark.usefixtures("reset_object_registry")
+def test_snowflake_query_sync(snowflake_connector):
+    result = query_sync_flow(snowflake_connector)
+    assert result == [("query", _PARAMS, "sync")]
 
-    result = test_flow()
-    assert result[0][0][0] == BEGIN_TRANSACTION_STATEMENT
-    assert result[1][0][0] == "query1"
-    assert result[1][0][1] == ("param",)
-    assert result[2][0][0] == "query2"
-    assert result[2][0][1] == ("param",)
-    assert result[3][0][0] == END_TRANSACTION_STATEMENT
 
+@pytest.mark.usefixtures("reset_object_registry")
+def test_snowflake_query_sync_result_format(snowflake_connector):
+    result = query_sync_flow(snowflake_connector, result_format="arrow")
+    assert result == ("arrow", [("query", _PARAMS, "sync")])
+
+
+@pytest.mark.usefixtures("reset_object_registry")
+@pytest.mark.parametrize("result_format", ["Arrow", "polars"])
+def test_snowflake_query_unsupported_result_format(snowflake_connector, result_format):
+    with pytest.raises(ValueError, match="Unsupported result_format"):
+        query_flow(snowflake_connector, result_format=result_format)
+    with pytest.raises(ValueError, match="Unsupported result_format"):
+        query_sync_flow(snowflake_connector, result_format=result_format)
+
+
+async def test_snowflake_multiquery_unsupported_result_format(snowflake_connector):
+    with pytest.raises(ValueError, match="Unsupported result_format"):
+        await snowflake_multiquery.fn(
+            ["query1", "query2"], snowflake_connector, result_format="polars"
+        )
+
+
+def test_fetch_all_arrow_empty_result():
+    cursor = SnowflakeCursor()
+    cursor.query_result = []
+    assert _fetch_all(cursor, "arrow") == ("arrow", [])
 
-def test_snowflake_query_sync(snowflake_connector):
-    @flow()
-    def test_snowflake_query_sync_flow():
-        result = snowflake_query_sync("query", snowflake_connector, params=("param",))
-        return result
 
-    result = test_snowflake_query_sync_flow()
-    assert result[0][0] == "query"
-    assert result[0][1] == ("param",)
-    assert result[0][2] == "sync"
+def test_fetch_all_arrow_empty_result_without_force_return_table(monkeypatch):
+    pyarrow = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(
+        "prefect_snowflake.database._FETCH_ARROW_ALL_FORCES_TABLE", False
+    )
+    cursor = MagicMock()
+    cursor.fetch_arrow_all.return_value = None
+    cursor.description = [("ID", 0), ("NAME", 2)]
+    table = _fetch_all(cursor, "arrow")
+    assert isinstance(table, pyarrow.Table)
+    assert table.num_rows == 0
+    assert table.column_names == ["ID", "NAME"]
 
 
 def test_snowflake_private_connector_init(private_connector_params):
     snowflake_connector = SnowflakeConnector(**private_connector_params)
-    actual_connector_params = snowflake_connector.dict()
-    for param in private_connector_params:
-        expected = private_connector_params[param]
-        if param == "schema":
-            param = "schema_"
-        actual = actual_connector_params[param]
-        if isinstance(actual, (SecretStr, SecretBytes)):
-            actual = actual.get_secret_value()
-        assert actual == expected
+    expected = {
+        ("schema_" if param == "schema" else param): value
+        for param, value in private_connector_params.items()
+    }
+    actual = {
+        param: (
+            value.get_secret_value()
+            if isinstance(value, (SecretStr, SecretBytes))
+            else value
+        )
+        for param, value in snowflake_connector.dict().items()
+        if param in expected
+    }
+    assert actual == expected
 
 
 class TestSnowflakeConnector:
@@ -208,6 +369,34 @@ class TestSnowflakeConnector:
         assert snowflake_connector._connection is connection
         assert caplog.records[0].msg == "Started a new connection to Snowflake."
 
+    def test_get_connection_client_prefetch_threads(
+        self, connector_params, snowflake_connect_mock
+    ):
+        snowflake_connector = SnowflakeConnector(
+            **connector_params, client_prefetch_threads=1
+        )
+        snowflake_connector.get_connection()
+        _, kwargs = snowflake_connect_mock.call_args
+        assert kwargs["client_prefetch_threads"] == 1
+
+    def test_get_connection_reuses_open_connection(
+        self, snowflake_connector: SnowflakeConnector, snowflake_connect_mock
+    ):
+        connection = snowflake_connector.get_connection()
+        assert snowflake_connector.get_connection() is connection
+        snowflake_connect_mock.assert_called_once()
+
+    def test_get_connection_reconnects_when_closed(
+        self, snowflake_connector: SnowflakeConnector, snowflake_connect_mock
+    ):
+        snowflake_connector._start_connection()
+        snowflake_connector._unique_cursors["12345"] = MagicMock()
+        snowflake_connector._connection.is_closed.return_value = True
+
+        snowflake_connector._start_connection()
+        assert snowflake_connect_mock.call_count == 2
+        assert snowflake_connector._unique_cursors == {}
+
     def test_reset_cursors(self, snowflake_connector: SnowflakeConnector, caplog):
         mock_cursor = MagicMock()
         snowflake_connector.reset_cursors()
@@ -225,6 +414,26 @@ class TestSnowflakeConnector:
         result = snowflake_connector.fetch_one("query", parameters=("param",))
         assert result == (1,)
 
+    def test_fetch_all_polls_with_backoff(
+        self, snowflake_connector: SnowflakeConnector, monkeypatch
+    ):
+        delays = []
+
+        async def mock_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(
+            "prefect_snowflake.database.asyncio", SimpleNamespace(sleep=mock_sleep)
+        )
+        snowflake_connector._start_connection()
+        is_still_running = snowflake_connector._connection.is_still_running
+        is_still_running.side_effect = [True] * 10 + [False]
+
+        snowflake_connector.fetch_all("query", parameters=("param",))
+        assert delays == pytest.approx(
+            [0.005, 0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1, 1]
+        )
+
     def test_fetch_one_cursor_set_to_dict_cursor(
         self, snowflake_connector: SnowflakeConnector
     ):